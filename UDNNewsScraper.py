@@ -1,21 +1,99 @@
-import time
 import re
+import csv
 import math
+import sqlite3
+import signal
+import atexit
+import asyncio
+import threading
+import fnmatch
+import multiprocessing
+from multiprocessing.util import Finalize
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+import aiohttp
+import lxml.html
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from yarl import URL
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.edge.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from tqdm import tqdm
 
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    async_playwright = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Columns of the scraped news data
+_COLUMNS = ['News ID', 'Title', 'Date', 'Content']
+
+# Key marking article dictionaries whose title and body were both found on a fully loaded page;
+# removed before the row is saved and only such articles are cached
+_COMPLETE_KEY = '_complete'
+
+# Regular expressions used while scraping, compiled once
+_NEWS_ID_RE = re.compile(r'news_id=(\d+)')
+_ALT_ID_RE = re.compile(r'/(\d+)$')
+_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_TOTAL_RE = re.compile(r'共搜尋到\s*(\d+)\s*筆')
+_PAGE_RE = re.compile(r'page=\d+')
+
+# Menu labels removed from body text; matched in one linear pass when pyahocorasick is installed
+_MENU_WORDS = ['Login', 'Register', 'Member', 'Home', 'News', 'Sports', 'Entertainment', 'Finance', 'Health']
+_MENU_RE = re.compile('|'.join(_MENU_WORDS))
+if ahocorasick is not None:
+    _MENU_AUTOMATON = ahocorasick.Automaton()
+    for _word in _MENU_WORDS:
+        _MENU_AUTOMATON.add_word(_word, len(_word))
+    _MENU_AUTOMATON.make_automaton()
+else:
+    _MENU_AUTOMATON = None
+
+# Resource types the Playwright backend never downloads
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# URL patterns of fonts, stylesheets and tracking/ad domains the browsers never download
+_BLOCKED_URL_PATTERNS = [
+    "*.woff*",
+    "*.ttf",
+    "*.css",
+    "*googletagmanager*",
+    "*doubleclick*",
+    "*google-analytics*",
+    "*googlesyndication*",
+    "*facebook.net*",
+    "*scorecardresearch*"
+]
+
+# Candidate containers of the article body, tried in order
+_ARTICLE_SELECTORS = [
+    "//article",
+    "//div[contains(@class, 'article')]",
+    "//div[contains(@class, 'content')]",
+    "//div[contains(@class, 'story')]"
+]
+
+# Seconds to wait for the article workers to exit before terminating the pool
+_POOL_JOIN_TIMEOUT = 30
+
 class UDNNewsScraper:
     """
     Class for scraping news articles from UDN News website
     """
     
-    def __init__(self, edge_driver_path='/usr/local/bin/msedgedriver', user_data_dir=None, headless=False):
+    def __init__(self, edge_driver_path='/usr/local/bin/msedgedriver', user_data_dir=None, headless=False, cache_path='udn_cache.sqlite'):
         """
         Initialize the UDN News Scraper
         
@@ -23,13 +101,20 @@ class UDNNewsScraper:
             edge_driver_path (str): Path to the Edge WebDriver executable
             user_data_dir (str): Path to Edge user data directory for using logged-in session
             headless (bool): Whether to run the browser in headless mode
+            cache_path (str): Path to the SQLite file caching fetched articles, or None to disable caching
         """
         self.edge_driver_path = edge_driver_path
         self.user_data_dir = user_data_dir
         self.headless = headless
+        self.cache_path = cache_path
+        self._cache = None
         self.driver = None
         self.wait = None
         self.service = None
+        self._logged_in = False
+        self._pool = None
+        self._pool_config = None
+        self._pool_cancel = None
         
     def _setup_driver(self):
         """
@@ -57,6 +142,9 @@ class UDNNewsScraper:
         edge_options.add_argument("--no-sandbox")
         edge_options.add_argument("--disable-dev-shm-usage")
         
+        # Return from driver.get at DOMContentLoaded instead of waiting for every subresource
+        edge_options.set_capability("pageLoadStrategy", "eager")
+        
         # Add headless mode if requested
         if self.headless:
             edge_options.add_argument("--headless")
@@ -71,111 +159,315 @@ class UDNNewsScraper:
         
         # Initialize WebDriver
         driver = webdriver.Edge(service=service, options=edge_options)
-        wait = WebDriverWait(driver, 10)
+        # Bound page loads and scripts so a stalled page cannot hang the run
+        driver.set_page_load_timeout(12)
+        driver.set_script_timeout(5)
+        
+        _block_urls(driver)
+        
+        # Poll often so waits return as soon as an element appears
+        wait = WebDriverWait(driver, 10, poll_frequency=0.05)
         
         return driver, wait, service
     
-    def _fetch_article_content(self, driver, link, index, total, wait):
+    async def _fetch_listing_pages(self, page_urls, cookies, user_agent, pbar=None, concurrency=10):
         """
-        Fetch content from a single article
+        Fetch search result pages concurrently over HTTP and extract news links
         
         Args:
-            driver: WebDriver instance
-            link: Article link URL
-            index: Article index
-            total: Total number of articles
-            wait: WebDriverWait instance
+            page_urls (list): URLs of the search result pages
+            cookies (list): Cookies from the Selenium session (driver.get_cookies())
+            user_agent (str): User agent string of the Selenium session
+            pbar: Optional tqdm progress bar updated after each page
+            concurrency (int): Maximum number of simultaneous requests
         
         Returns:
-            dict: Dictionary containing title, date, and content
+            list: One list of (title, link, date, summary) tuples per page, in page order
         """
-        try:
-            # Open the article page
-            driver.get(link)
-            time.sleep(2)
-
-            # Extract news ID from the URL
-            news_id = "Unknown ID"
-            try:
-                # Use regex to find news_id parameter in the URL
-                news_id_match = re.search(r'news_id=(\d+)', link)
-                if news_id_match:
-                    news_id = news_id_match.group(1)
-                else:
-                    # Try other patterns that might appear in the URL
-                    alt_id_match = re.search(r'/(\d+)$', link)
-                    if alt_id_match:
-                        news_id = alt_id_match.group(1)
-            except Exception as id_error:
-                print(f"Error extracting news ID: {id_error}")
-            
-            # Extract title
-            try:
-                title_element = wait.until(EC.presence_of_element_located((By.XPATH, "//h1")))
-                title = title_element.text
-            except:
-                # If h1 title not found, try to get it from other sources
-                title = f"Article {index} (title extraction failed)"
-            
-            # Extract date
-            try:
-                date_element = wait.until(EC.presence_of_element_located((By.XPATH, "//span[@class='story-source']")))
-                date_text = date_element.text
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', date_text)
-                if date_match:
-                    article_date = date_match.group(1)
-                else:
-                    article_date = "Unknown date"
-            except:
-                article_date = "Unknown date"
+        # Reuse the logged-in browser session for the HTTP requests
+        cookie_jar = aiohttp.CookieJar()
+        for cookie in cookies:
+            domain = cookie.get('domain', 'udndata.com').lstrip('.')
+            cookie_jar.update_cookies({cookie['name']: cookie['value']}, response_url=URL(f"https://{domain}/"))
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        timeout = aiohttp.ClientTimeout(total=15)
+        
+        async with aiohttp.ClientSession(cookie_jar=cookie_jar, headers={'User-Agent': user_agent}, timeout=timeout) as session:
+            async def fetch(url):
+                links = []
+                try:
+                    async with semaphore:
+                        async with session.get(url) as response:
+                            html = await response.text()
+                    links = _parse_listing_html(html, url)
+                except Exception as e:
+                    print(f"Error fetching page {url}: {e}")
+                if pbar is not None:
+                    pbar.update(1)
+                return links
             
-            # Extract content
-            try:
-                article_selectors = [
-                    "//article",
-                    "//div[contains(@class, 'article')]",
-                    "//div[contains(@class, 'content')]",
-                    "//div[contains(@class, 'story')]"
-                ]
+            return await asyncio.gather(*[fetch(url) for url in page_urls])
+    
+    def _fetch_listing_pages_in_tabs(self, page_urls, batch_size=10):
+        """
+        Fetch search result pages in browser tabs, loading a batch of tabs at once
+        
+        Args:
+            page_urls (list): URLs of the search result pages
+            batch_size (int): Maximum number of tabs open at the same time
+        
+        Returns:
+            dict: Mapping of page URL to its list of (title, link, date, summary) tuples
+        """
+        driver = self.driver
+        wait = self.wait
+        main_handle = driver.current_window_handle
+        page_links = {}
+        
+        try:
+            for start in range(0, len(page_urls), batch_size):
+                # Open the whole batch first so the pages load in parallel
+                tabs = []
+                for page_url in page_urls[start:start + batch_size]:
+                    driver.switch_to.new_window('tab')
+                    # URL blocking only applies to the tab it was set on, so set it before navigating
+                    _block_urls(driver)
+                    driver.execute_script("window.location.href = arguments[0];", page_url)
+                    tabs.append((page_url, driver.current_window_handle))
                 
-                content = ""
-                for selector in article_selectors:
+                for page_url, handle in tabs:
+                    driver.switch_to.window(handle)
                     try:
-                        article_elements = driver.find_elements(By.XPATH, selector)
-                        if article_elements:
-                            article_element = article_elements[0]
-                            paragraphs = article_element.find_elements(By.TAG_NAME, "p")
-                            if paragraphs:
-                                content = '\n'.join([p.text for p in paragraphs if p.text])
-                                if content:
-                                    break
-                    except:
-                        continue
+                        wait.until(EC.presence_of_all_elements_located((By.XPATH, "//h2[@class='control-pic']/a")))
+                        page_links[page_url] = _parse_listing_html(driver.page_source, page_url)
+                    except Exception as e:
+                        print(f"Error processing page {page_url}: {e}")
+                    finally:
+                        driver.close()
+        finally:
+            # Close tabs left open by an error mid-batch, since the driver outlives this call
+            for handle in driver.window_handles:
+                if handle != main_handle:
+                    try:
+                        driver.switch_to.window(handle)
+                        driver.close()
+                    except Exception:
+                        pass
+            driver.switch_to.window(main_handle)
+        
+        return page_links
+    
+    async def _fetch_articles_playwright(self, items, cookies, on_article, concurrency=8):
+        """
+        Fetch articles concurrently in one Playwright browser context
+        
+        Args:
+            items (list): (index, title, link) tuples of the articles
+            cookies (list): Cookies from the Selenium session (driver.get_cookies())
+            on_article: Callback receiving each article dictionary as soon as it is fetched
+            concurrency (int): Maximum number of pages open at the same time
+        """
+        async def block_resources(route):
+            request = route.request
+            if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(fnmatch.fnmatchcase(request.url, pattern) for pattern in _BLOCKED_URL_PATTERNS):
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(channel="msedge", headless=self.headless)
+            try:
+                context = await browser.new_context()
+                await context.add_cookies([
+                    {'name': cookie['name'], 'value': cookie['value'], 'domain': cookie['domain'], 'path': cookie.get('path', '/')}
+                    for cookie in cookies if cookie.get('domain')
+                ])
+                await context.route("**/*", block_resources)
                 
-                if not content:
-                    # If all selectors fail, try to get text from body
-                    body_element = driver.find_element(By.TAG_NAME, "body")
-                    content = body_element.text
-                    # Clean content, remove menus, headers, footers
-                    content = re.sub(r'(Login|Register|Member|Home|News|Sports|Entertainment|Finance|Health)', '', content)
-            except:
-                content = "Content extraction failed"
-            
-            return {
-                'News ID': news_id,
-                'Title': title,
-                'Date': article_date,
-                'Content': content
-            }
-        except Exception as e:
-            print(f"Error processing article: {e}")
-            return {
-                'Title': f"Article {index} (processing failed)",
-                'Date': "Unknown date",
-                'Content': f"Content extraction failed: {str(e)}"
+                semaphore = asyncio.Semaphore(concurrency)
+                
+                async def fetch(index, title, link):
+                    async with semaphore:
+                        page = await context.new_page()
+                        try:
+                            article_data = await _fetch_article_content_playwright(page, link, index)
+                        except Exception as e:
+                            print(f"Error processing news: {e}")
+                            article_data = {
+                                'Title': title,
+                                'Date': "Unknown date",
+                                'Content': "Content extraction failed"
+                            }
+                        finally:
+                            await page.close()
+                    on_article(article_data)
+                
+                await asyncio.gather(*[fetch(index, title, link) for index, title, link in items])
+            finally:
+                await browser.close()
+    
+    def _open_cache(self):
+        """
+        Open the article cache on first use
+        
+        Returns:
+            sqlite3.Connection: Cache connection, or None if caching is disabled
+        """
+        if self._cache is None and self.cache_path:
+            # Articles may be cached from the thread running a coroutine (see _run_coroutine)
+            self._cache = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self._cache.execute("CREATE TABLE IF NOT EXISTS articles (news_id TEXT PRIMARY KEY, title TEXT, date TEXT, content TEXT)")
+        return self._cache
+    
+    def _get_cached_article(self, link):
+        """
+        Look up a previously fetched article in the cache
+        
+        Args:
+            link: Article link URL
+        
+        Returns:
+            dict: Dictionary containing title, date, and content, or None if the article is not cached
+        """
+        if self._open_cache() is None:
+            return None
+        
+        news_id = _extract_news_id(link)
+        if news_id == "Unknown ID":
+            return None
+        row = self._cache.execute("SELECT title, date, content FROM articles WHERE news_id = ?", (news_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'News ID': news_id,
+            'Title': row[0],
+            'Date': row[1],
+            'Content': row[2]
+        }
+    
+    def _cache_article(self, article_data):
+        """
+        Store a completely fetched article in the cache
+        
+        Args:
+            article_data (dict): Dictionary containing title, date, and content
+        """
+        if self._open_cache() is None:
+            return
+        news_id = article_data.get('News ID', "Unknown ID")
+        if news_id == "Unknown ID":
+            return
+        with self._cache:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO articles (news_id, title, date, content) VALUES (?, ?, ?, ?)",
+                (news_id, article_data['Title'], article_data['Date'], article_data['Content'])
+            )
+    
+    def _fetch_articles_selenium(self, items, cookies, workers, max_connections, on_article):
+        """
+        Fetch articles in parallel, each worker process owning its own browser
+        
+        Args:
+            items (list): (index, title, link) tuples of the articles
+            cookies (list): Cookies from the Selenium session (driver.get_cookies())
+            workers (int): Maximum number of browser processes
+            max_connections (int): Maximum number of article pages loading at the same time
+            on_article: Callback receiving each article dictionary as soon as it is fetched
+        """
+        # Start no more browsers than there are articles, and keep them running between scrape
+        # calls unless a larger pool or a different connection limit is needed
+        pool_size = min(workers, len(items))
+        if self._pool is not None:
+            current_size, current_connections = self._pool_config
+            if pool_size > current_size or max_connections != current_connections:
+                self._shutdown_pool()
+        if self._pool is None:
+            self._pool_cancel = multiprocessing.Event()
+            self._pool = multiprocessing.Pool(
+                pool_size,
+                initializer=_init_article_worker,
+                initargs=(self.edge_driver_path, self.headless, cookies, multiprocessing.Semaphore(max_connections), self._pool_cancel)
+            )
+            self._pool_config = (pool_size, max_connections)
+            # The workers are daemonic and would be killed with their browsers still running at exit
+            atexit.register(self._shutdown_pool)
+        
+        try:
+            for article_data in self._pool.imap_unordered(_article_worker, items, chunksize=4):
+                on_article(article_data)
+        except BaseException:
+            self._shutdown_pool()
+            raise
+    
+    def _shutdown_pool(self):
+        """
+        Stop the article workers so that each one quits its browser
+        
+        Queued articles are skipped instead of fetched. The pool is only terminated if the
+        workers do not exit within _POOL_JOIN_TIMEOUT seconds (e.g. when a worker keeps
+        failing to start its browser), since terminating them can leave Edge processes running.
+        """
+        if self._pool is None:
+            return
+        atexit.unregister(self._shutdown_pool)
+        self._pool_cancel.set()
+        self._pool.close()
+        # Pool.join has no timeout, so wait for it in a helper thread
+        joiner = threading.Thread(target=self._pool.join, daemon=True)
+        joiner.start()
+        joiner.join(_POOL_JOIN_TIMEOUT)
+        if joiner.is_alive():
+            print("Article workers did not exit in time, terminating them")
+            self._pool.terminate()
+            joiner.join()
+        self._pool = None
+        self._pool_config = None
+        self._pool_cancel = None
+    
+    def _fetch_articles_http(self, items, cookies, user_agent, max_connections, on_article):
+        """
+        Fetch server-rendered articles over HTTP in a thread pool
+        
+        Args:
+            items (list): (index, title, link) tuples of the articles
+            cookies (list): Cookies from the Selenium session (driver.get_cookies())
+            user_agent (str): User agent string of the Selenium session
+            max_connections (int): Maximum number of article requests in flight at the same time
+            on_article: Callback receiving each article dictionary as soon as it is fetched
+        
+        Returns:
+            list: (index, title, link) tuples of the articles that could not be parsed
+        """
+        # Reuse the logged-in browser session for the HTTP requests
+        session = requests.Session()
+        session.headers['User-Agent'] = user_agent
+        session.mount('https://', HTTPAdapter(pool_maxsize=max_connections))
+        session.mount('http://', HTTPAdapter(pool_maxsize=max_connections))
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        
+        failed_items = []
+        with ThreadPoolExecutor(max_workers=max_connections) as executor:
+            futures = {
+                executor.submit(_fetch_article_content_http, session, link): (index, title, link)
+                for index, title, link in items
             }
+            for future in as_completed(futures):
+                try:
+                    article_data = future.result()
+                except Exception as e:
+                    print(f"Error fetching article {futures[future][2]}: {e}")
+                    article_data = None
+                if article_data is None:
+                    failed_items.append(futures[future])
+                else:
+                    on_article(article_data)
+        
+        session.close()
+        return failed_items
     
-    def scrape(self, keyword, start_date, end_date, output_file=None, manual_mode=False, max_pages=None, max_articles=50):
+    def scrape(self, keyword, start_date, end_date, output_file=None, manual_mode=False, max_pages=None, max_articles=50, workers=4, max_connections=4, backend='http', return_df=True, content=True, refresh_cache=False):
         """
         Main scraping method to fetch news articles based on search criteria
         
@@ -187,37 +479,81 @@ class UDNNewsScraper:
             manual_mode (bool): Whether to enable manual login mode
             max_pages (int): Maximum number of pages to scrape
             max_articles (int): Maximum number of articles to scrape
+            workers (int): Number of browser processes fetching articles in parallel
+            max_connections (int): Maximum number of article pages loading at the same time, for every backend
+            backend (str): Article fetcher, 'http' (plain HTTP with browser fallback), 'selenium' (worker pool) or 'playwright'
+            return_df (bool): Whether to read the saved CSV back into a DataFrame when output_file is given
+            content (bool): Whether to open each article for its full content; if False, only the
+                title, date and summary shown in the search results are saved, with the summary as Content
+            refresh_cache (bool): Whether to fetch every article again instead of reading it from the cache,
+                replacing the cached copies
             
         Returns:
-            DataFrame: Pandas DataFrame containing the scraped news data
+            DataFrame: Pandas DataFrame containing the scraped news data,
+            or the number of saved articles if output_file is given and return_df is False
         """
-        # Initialize WebDriver
-        self.driver, self.wait, self.service = self._setup_driver()
+        if backend not in ('http', 'selenium', 'playwright'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == 'playwright' and async_playwright is None:
+            raise ImportError("The 'playwright' backend requires the playwright package")
+        
+        # Initialize WebDriver unless a session is already open
+        if self.driver is None:
+            self.driver, self.wait, self.service = self._setup_driver()
         driver = self.driver
         wait = self.wait
         
-        # List to store news data
+        # Articles are written to the CSV file as they arrive and only kept in memory without one
         news_data = []
+        article_count = 0
+        csv_file = None
+        writer = None
+        
+        def save_article(article_data):
+            nonlocal article_count
+            article_count += 1
+            if writer is not None:
+                writer.writerow(article_data)
+                csv_file.flush()
+            else:
+                news_data.append(article_data)
+        
+        def results():
+            if not output_file:
+                return pd.DataFrame(news_data, columns=_COLUMNS)
+            if not return_df:
+                return article_count
+            if writer is None:
+                # Failed before the CSV file was opened
+                return pd.DataFrame(columns=_COLUMNS)
+            csv_file.close()
+            return pd.read_csv(output_file, dtype=str, keep_default_na=False, encoding='utf-8-sig')
         
         try:
-            # Open UDN search page
-            driver.get("https://udndata.com/ndapp/Index?cp=udn")
-            print("Opened UDN News search page")
-            
-            # Click on the "IP Login" link
-            try:
-                login_link = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '定址登入')]")))
-                driver.execute_script("arguments[0].scrollIntoView(true);", login_link)
-                driver.execute_script("arguments[0].click();", login_link)
-                time.sleep(3)
-                if manual_mode:
-                    print("Please complete the login process in the browser and press Enter to continue...")
-                    input()
-            except Exception as e:
-                print(f"Error when clicking 'IP Login': {e}")
-                print("Continuing with search process...")
-            
-            driver.get("https://udndata.com/ndapp/Index?cp=udn")
+            # Log in once per browser session; later calls go straight to the search page
+            if not self._logged_in:
+                # Open UDN search page
+                _load_page(driver, "https://udndata.com/ndapp/Index?cp=udn")
+                print("Opened UDN News search page")
+                
+                # Click on the "IP Login" link
+                try:
+                    login_link = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '定址登入')]")))
+                    _scroll_click(driver, login_link)
+                    try:
+                        # Wait for the login page to replace the search page
+                        wait.until(EC.staleness_of(login_link))
+                    except TimeoutException:
+                        pass
+                    if manual_mode:
+                        print("Please complete the login process in the browser and press Enter to continue...")
+                        input()
+                    self._logged_in = True
+                except Exception as e:
+                    print(f"Error when clicking 'IP Login': {e}")
+                    print("Continuing with search process...")
+                
+            _load_page(driver, "https://udndata.com/ndapp/Index?cp=udn")
             
             # Enter search keyword
             search_input = wait.until(EC.element_to_be_clickable((By.ID, "SearchString")))
@@ -237,98 +573,525 @@ class UDNNewsScraper:
             
             # Click the search button
             submit_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@name='submit']")))
-            driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
-            driver.execute_script("arguments[0].click();", submit_button)
+            _scroll_click(driver, submit_button)
             print("Clicked search button")
             
             # Wait for results page to load
-            time.sleep(5)
+            try:
+                wait.until(EC.staleness_of(submit_button))
+            except TimeoutException:
+                pass
             
             # Get total result count and calculate total pages
             result_message = wait.until(EC.presence_of_element_located((By.XPATH, "//div[@class='message']")))
-            result_text = result_message.text
-            total_results_match = re.search(r'共搜尋到\s*<span class="mark">(\d+)</span>筆資料', driver.page_source)
-            total_results = int(total_results_match.group(1)) if total_results_match else 0
+            total_results_match = _TOTAL_RE.search(result_message.text)
+            if total_results_match:
+                total_results = int(total_results_match.group(1))
+            else:
+                print(f"Could not read the result count from: {result_message.text}")
+                total_results = 0
             total_pages = math.ceil(total_results / 20)
             
             if max_pages is not None and max_pages > 0:
                 total_pages = min(max_pages, total_pages)
             
-            # Store all news links and titles
-            news_links = []
+            # Build the URL of every result page up-front
+            current_url = driver.current_url
+            page_urls = [_page_url(current_url, current_page) for current_page in range(1, total_pages + 1)]
             
-            # Use tqdm to show progress
+            # Fetch all result pages concurrently, reusing the browser session cookies
+            cookies = driver.get_cookies()
+            user_agent = driver.execute_script("return navigator.userAgent;")
             with tqdm(total=total_pages, desc="抓取文章資訊", unit="頁") as pbar:
-                # Process each page of results
-                for current_page in range(1, total_pages + 1):
-                    if current_page > 1:
-                        # Navigate to next page
-                        current_url = driver.current_url
-                        if "page=" in current_url:
-                            next_page_url = re.sub(r'page=\d+', f'page={current_page}', current_url)
-                        else:
-                            if "?" in current_url:
-                                next_page_url = f"{current_url}&page={current_page}"
-                            else:
-                                next_page_url = f"{current_url}?page={current_page}"
-                        driver.get(next_page_url)
-                        time.sleep(3)
-                    
-                    # Get news links and titles from current page
-                    title_elements = wait.until(EC.presence_of_all_elements_located((By.XPATH, "//h2[@class='control-pic']/a")))
-                    for title_element in title_elements:
-                        title = title_element.text
-                        link = title_element.get_attribute('href')
-                        news_links.append((title, link))
-                    
-                    pbar.update(1)  # Update progress bar after processing each page
+                pages = _run_coroutine(self._fetch_listing_pages(page_urls, cookies, user_agent, pbar))
+            
+            # Fall back to the browser for pages that could not be read over HTTP
+            failed_page_urls = [page_url for page_url, page_links in zip(page_urls, pages) if not page_links]
+            fallback_links = self._fetch_listing_pages_in_tabs(failed_page_urls) if failed_page_urls else {}
+            
+            # Store all news links and titles
+            news_links = []
+            for page_url, page_links in zip(page_urls, pages):
+                news_links.extend(page_links or fallback_links.get(page_url, []))
             
             # Set maximum number of articles to process
             news_links = news_links[:min(len(news_links), max_articles)]
             
-            # Use tqdm for progress bar
-            with tqdm(total=len(news_links), desc=f"{keyword}文章爬取", unit="文章") as pbar:
-                for index, (title, link) in enumerate(news_links, 1):
-                    try:
-                        article_data = self._fetch_article_content(driver, link, index, len(news_links), wait)
-                        news_data.append(article_data)
-                    except Exception as e:
-                        print(f"Error processing news: {e}")
-                        news_data.append({
-                            'Title': title,
-                            'Date': "Unknown date",
-                            'Content': "Content extraction failed"
-                        })
-                    pbar.update(1)  # Update progress bar
+            items = [(index, title, link) for index, (title, link, _, _) in enumerate(news_links, 1)]
+            
+            if output_file:
+                csv_file = open(output_file, 'w', encoding='utf-8-sig', newline='')
+                writer = csv.DictWriter(csv_file, fieldnames=_COLUMNS)
+                writer.writeheader()
+            
+            if not content:
+                # The search results already carry the metadata, so no article page is opened
+                for title, link, article_date, summary in news_links:
+                    save_article({
+                        'News ID': _extract_news_id(link),
+                        'Title': title,
+                        'Date': article_date,
+                        'Content': summary
+                    })
+            elif items:
+                with tqdm(total=len(items), desc=f"{keyword}文章爬取", unit="文章") as pbar:
+                    def on_article(article_data):
+                        # Placeholders, body-text fallbacks and stopped loads are saved but never cached
+                        complete = article_data.pop(_COMPLETE_KEY, False)
+                        save_article(article_data)
+                        if complete:
+                            self._cache_article(article_data)
+                        pbar.update(1)  # Update progress bar
+                    
+                    # Articles fetched by an earlier run are taken from the cache unless it is refreshed
+                    uncached_items = []
+                    for index, title, link in items:
+                        cached_article = None if refresh_cache else self._get_cached_article(link)
+                        if cached_article is None:
+                            uncached_items.append((index, title, link))
+                        else:
+                            save_article(cached_article)
+                            pbar.update(1)
+                    
+                    if uncached_items:
+                        if backend == 'playwright':
+                            # Fetch articles concurrently in one Playwright browser context
+                            _run_coroutine(self._fetch_articles_playwright(uncached_items, cookies, on_article, concurrency=max_connections))
+                        elif backend == 'http':
+                            # Fetch articles over plain HTTP, using the browser only for pages that need rendering
+                            failed_items = self._fetch_articles_http(uncached_items, cookies, user_agent, max_connections, on_article)
+                            if failed_items:
+                                self._fetch_articles_selenium(failed_items, cookies, workers, max_connections, on_article)
+                        else:
+                            self._fetch_articles_selenium(uncached_items, cookies, workers, max_connections, on_article)
             
-            # Create DataFrame and save to CSV if output file is specified
-            if news_data:
-                df = pd.DataFrame(news_data)
+            if article_count:
                 if output_file:
-                    df.to_csv(output_file, index=False, encoding='utf-8-sig')
-                    print(f"\nSuccessfully saved {len(news_data)} articles to {output_file}")
-                return df
+                    print(f"\nSuccessfully saved {article_count} articles to {output_file}")
             else:
                 print("No news content extracted")
-                return pd.DataFrame(columns=['Title', 'Date', 'Content'])
+            return results()
         
         except Exception as e:
             print(f"Error occurred: {e}")
-            if news_data:
-                df = pd.DataFrame(news_data)
-                if output_file:
-                    df.to_csv(output_file, index=False, encoding='utf-8-sig')
-                    print(f"Saved partial data ({len(news_data)} articles) to {output_file}")
-                return df
-            return pd.DataFrame(columns=['Title', 'Date', 'Content'])
+            if article_count and output_file:
+                print(f"Saved partial data ({article_count} articles) to {output_file}")
+            return results()
         
         finally:
-            if self.driver:
-                self.driver.quit()
-                print("Browser closed")
+            if csv_file:
+                csv_file.close()
     
     def close(self):
-        """Close the browser if still open"""
+        """Close the browser, the article workers and the article cache if still open"""
+        self._shutdown_pool()
         if self.driver:
             self.driver.quit()
-            print("Browser closed")
\ No newline at end of file
+            print("Browser closed")
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        self.driver = None
+        self.wait = None
+        self.service = None
+        self._logged_in = False
+    
+    def __enter__(self):
+        """Start the browser so it can be reused for several scrape calls"""
+        if self.driver is None:
+            self.driver, self.wait, self.service = self._setup_driver()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the browser and the article workers"""
+        self.close()
+
+
+def _run_coroutine(coroutine):
+    """
+    Run a coroutine to completion from synchronous code
+    
+    Args:
+        coroutine: Coroutine to run
+    
+    Returns:
+        The result of the coroutine
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    
+    # asyncio.run cannot be nested inside a running event loop (e.g. Jupyter), so use a fresh loop in a thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def _load_page(driver, url):
+    """
+    Open a page, stopping the load if it exceeds the page load timeout
+    
+    Args:
+        driver: WebDriver instance
+        url: URL to open
+    
+    Returns:
+        bool: True if the page finished loading, False if the load was stopped
+    """
+    try:
+        driver.get(url)
+        return True
+    except TimeoutException:
+        # Continue with whatever DOM is ready instead of waiting for slow subresources
+        driver.execute_script("window.stop();")
+        return False
+
+
+def _block_urls(driver):
+    """
+    Block fonts, stylesheets, trackers and ad networks at the network layer of the current tab
+    
+    Args:
+        driver: WebDriver instance
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+
+
+def _scroll_click(driver, element):
+    """
+    Scroll an element into view and click it in a single WebDriver call
+    
+    Args:
+        driver: WebDriver instance
+        element: WebElement to click
+    """
+    driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", element)
+
+
+def _page_url(search_url, page):
+    """
+    Build the URL of a search result page
+    
+    Args:
+        search_url (str): URL of the first search result page
+        page (int): Page number
+    
+    Returns:
+        str: URL of the requested page
+    """
+    if "page=" in search_url:
+        return _PAGE_RE.sub(f'page={page}', search_url)
+    separator = '&' if '?' in search_url else '?'
+    return f"{search_url}{separator}page={page}"
+
+
+def _parse_listing_html(html, page_url):
+    """
+    Parse the news cards of a search result page
+    
+    Args:
+        html: Raw HTML of the search result page
+        page_url: URL of the page, used to resolve relative links
+    
+    Returns:
+        list: (title, link, date, summary) tuples of the news on the page
+    """
+    tree = lxml.html.fromstring(html)
+    links = []
+    for anchor in tree.xpath("//h2[@class='control-pic']/a"):
+        # The card around the headline also shows the publication date and a summary
+        cards = anchor.xpath("ancestor::li[1]")
+        card = cards[0] if cards else anchor.getparent().getparent()
+        date_match = _DATE_RE.search(card.text_content())
+        paragraphs = [p.text_content().strip() for p in card.iter('p')]
+        links.append((
+            anchor.text_content().strip(),
+            urljoin(page_url, anchor.get('href')),
+            date_match.group(1) if date_match else "Unknown date",
+            '\n'.join([text for text in paragraphs if text])
+        ))
+    return links
+
+
+def _extract_news_id(link):
+    """
+    Extract the news ID from an article URL
+    
+    Args:
+        link: Article link URL
+    
+    Returns:
+        str: News ID, or "Unknown ID" if the URL does not contain one
+    """
+    news_id = "Unknown ID"
+    try:
+        # Use regex to find news_id parameter in the URL
+        news_id_match = _NEWS_ID_RE.search(link)
+        if news_id_match:
+            news_id = news_id_match.group(1)
+        else:
+            # Try other patterns that might appear in the URL
+            alt_id_match = _ALT_ID_RE.search(link)
+            if alt_id_match:
+                news_id = alt_id_match.group(1)
+    except Exception as id_error:
+        print(f"Error extracting news ID: {id_error}")
+    return news_id
+
+
+def _strip_menu(content):
+    """
+    Remove menu labels from page text
+    
+    Args:
+        content (str): Text of the page body
+    
+    Returns:
+        str: Text with all menu labels removed
+    """
+    if _MENU_AUTOMATON is None:
+        return _MENU_RE.sub('', content)
+    
+    # Matches arrive ordered by end position; keep the text between non-overlapping matches
+    parts = []
+    position = 0
+    for end, length in _MENU_AUTOMATON.iter(content):
+        start = end - length + 1
+        if start >= position:
+            parts.append(content[position:start])
+            position = end + 1
+    parts.append(content[position:])
+    return ''.join(parts)
+
+
+def _parse_article_html(html, link, index, strict=False, encoding=None):
+    """
+    Parse an article page
+    
+    Args:
+        html: HTML of the article page
+        link: Article link URL
+        index: Article index
+        strict (bool): Whether to give up on pages without a title or article body
+            instead of falling back to placeholders and the body text
+        encoding (str): Character encoding of html if it is given as bytes
+    
+    Returns:
+        dict: Dictionary containing title, date, and content, or None if strict
+        and the page has to be rendered by a browser; _COMPLETE_KEY is True only
+        if the title came from <h1> and the content from an article container
+    """
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    tree = lxml.html.fromstring(html, parser=parser)
+    
+    # Extract title
+    title_elements = tree.xpath("//h1")
+    complete = bool(title_elements)
+    if title_elements:
+        title = title_elements[0].text_content().strip()
+    elif strict:
+        return None
+    else:
+        # If h1 title not found, try to get it from other sources
+        title = f"Article {index} (title extraction failed)"
+    
+    # Extract date
+    date_elements = tree.xpath("//span[@class='story-source']")
+    date_match = _DATE_RE.search(date_elements[0].text_content()) if date_elements else None
+    if date_match:
+        article_date = date_match.group(1)
+    else:
+        article_date = "Unknown date"
+    
+    # Extract content
+    content = ""
+    for selector in _ARTICLE_SELECTORS:
+        article_elements = tree.xpath(selector)
+        if article_elements:
+            paragraphs = [p.text_content().strip() for p in article_elements[0].iter('p')]
+            content = '\n'.join([text for text in paragraphs if text])
+            if content:
+                break
+    
+    if not content:
+        if strict:
+            return None
+        complete = False
+        # If all selectors fail, try to get text from body
+        body_elements = tree.xpath("//body")
+        if body_elements:
+            for element in body_elements[0].xpath(".//script|.//style|.//noscript"):
+                element.drop_tree()
+            # Clean content, remove menus, headers, footers
+            content = _strip_menu(body_elements[0].text_content())
+    
+    return {
+        'News ID': _extract_news_id(link),
+        'Title': title,
+        'Date': article_date,
+        'Content': content,
+        _COMPLETE_KEY: complete
+    }
+
+
+def _fetch_article_content(driver, link, index, wait):
+    """
+    Fetch content from a single article
+    
+    Args:
+        driver: WebDriver instance
+        link: Article link URL
+        index: Article index
+        wait: WebDriverWait instance
+    
+    Returns:
+        dict: Dictionary containing title, date, and content
+    """
+    try:
+        # Open the article page
+        loaded = _load_page(driver, link)
+        
+        # Wait for the article to render
+        try:
+            wait.until(EC.presence_of_element_located((By.XPATH, "//h1")))
+        except TimeoutException:
+            pass
+        
+        # Transfer the page once and run all selectors in-process
+        article_data = _parse_article_html(driver.page_source, link, index)
+        # A page whose load was stopped may be missing parts of the article
+        article_data[_COMPLETE_KEY] = article_data[_COMPLETE_KEY] and loaded
+        return article_data
+    except Exception as e:
+        print(f"Error processing article: {e}")
+        return {
+            'Title': f"Article {index} (processing failed)",
+            'Date': "Unknown date",
+            'Content': f"Content extraction failed: {str(e)}"
+        }
+
+
+def _fetch_article_content_http(session, link):
+    """
+    Fetch content from a single article over HTTP
+    
+    Args:
+        session: requests.Session carrying the logged-in cookies
+        link: Article link URL
+    
+    Returns:
+        dict: Dictionary containing title, date, and content, or None if the page has to be rendered by a browser
+    """
+    response = session.get(link, timeout=10)
+    response.raise_for_status()
+    # requests assumes ISO-8859-1 when the header has no charset, so detect the encoding instead
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    else:
+        encoding = response.apparent_encoding
+    return _parse_article_html(response.content, link, None, strict=True, encoding=encoding)
+
+
+async def _fetch_article_content_playwright(page, link, index):
+    """
+    Fetch content from a single article with a Playwright page
+    
+    Args:
+        page: Playwright Page instance
+        link: Article link URL
+        index: Article index
+    
+    Returns:
+        dict: Dictionary containing title, date, and content
+    """
+    try:
+        # Open the article page, continuing with whatever has loaded if it stalls
+        loaded = True
+        try:
+            await page.goto(link, wait_until='domcontentloaded', timeout=12000)
+        except PlaywrightTimeoutError:
+            loaded = False
+        
+        # Wait for the article to render
+        try:
+            await page.wait_for_selector("xpath=//h1", state='attached', timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
+        
+        article_data = _parse_article_html(await page.content(), link, index)
+        # A page whose load was stopped may be missing parts of the article
+        article_data[_COMPLETE_KEY] = article_data[_COMPLETE_KEY] and loaded
+        return article_data
+    except Exception as e:
+        print(f"Error processing article: {e}")
+        return {
+            'Title': f"Article {index} (processing failed)",
+            'Date': "Unknown date",
+            'Content': f"Content extraction failed: {str(e)}"
+        }
+
+
+# Per-process state of the article worker pool
+_worker_driver = None
+_worker_wait = None
+_worker_semaphore = None
+_worker_cancel = None
+
+
+def _init_article_worker(edge_driver_path, headless, cookies, semaphore, cancel_event):
+    """
+    Start the browser of an article worker process and log it in
+    
+    Args:
+        edge_driver_path (str): Path to the Edge WebDriver executable
+        headless (bool): Whether to run the browser in headless mode
+        cookies (list): Cookies of the logged-in main browser session
+        semaphore: Shared semaphore limiting concurrent page loads on the UDN domain
+        cancel_event: Shared event telling the workers to skip their remaining articles
+    """
+    global _worker_driver, _worker_wait, _worker_semaphore, _worker_cancel
+    
+    # Ctrl+C reaches the whole process group; only the parent handles it and cancels the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    
+    # Edge profiles cannot be shared between running browsers, so the session is carried over by cookies
+    scraper = UDNNewsScraper(edge_driver_path=edge_driver_path, headless=headless)
+    _worker_driver, _worker_wait, _ = scraper._setup_driver()
+    _worker_semaphore = semaphore
+    _worker_cancel = cancel_event
+    
+    # Quit the browser when the worker process exits
+    Finalize(None, _worker_driver.quit, exitpriority=16)
+    
+    _load_page(_worker_driver, "https://udndata.com/ndapp/Index?cp=udn")
+    for cookie in cookies:
+        try:
+            _worker_driver.add_cookie({key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure') if key in cookie})
+        except Exception as e:
+            print(f"Error setting cookie {cookie.get('name')}: {e}")
+
+
+def _article_worker(item):
+    """
+    Fetch a single article in a worker process
+    
+    Args:
+        item (tuple): (index, title, link) of the article
+    
+    Returns:
+        dict: Dictionary containing title, date, and content, or None if the pool is shutting down
+    """
+    index, title, link = item
+    if _worker_cancel.is_set():
+        return None
+    try:
+        with _worker_semaphore:
+            return _fetch_article_content(_worker_driver, link, index, _worker_wait)
+    except Exception as e:
+        print(f"Error processing news: {e}")
+        return {
+            'Title': title,
+            'Date': "Unknown date",
+            'Content': "Content extraction failed"
+        }